@@ -10,7 +10,6 @@ def configure_gemini():
         generation_config={
             'temperature': 0.1,
             'candidate_count': 1,
-            'max_output_tokens': 512,
-            'stream': True
+            'max_output_tokens': 512
         }
     )
\ No newline at end of file
@@ -1,6 +1,6 @@
 import asyncio
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from layers.perception import PerceptionLayer
 from layers.decision import DecisionLayer
 from layers.memory import MemoryLayer
@@ -30,41 +30,82 @@ class CryptoAnalyzer:
             
             # Enhanced Decision Making
             print("Processing decision with AI analysis...")
-            decision = await self.decision.make_decision(
-                perceived_data['technical_analysis'],
-                preferences,
-                historical_data
-            )
-            
-            # Create comprehensive analysis
-            analysis = Analysis(
-                symbol=symbol,
-                timestamp=datetime.now(),
-                technical_analysis=perceived_data['technical_analysis'],
-                market_data=perceived_data['market_data'],
-                decision=decision,
-                memory_context=historical_data
-            )
+            return await self._complete_analysis(symbol, perceived_data, preferences, historical_data)
             
-            # Store analysis in memory
-            await self.memory.store(
-                f"{symbol}_historical",
-                analysis.dict(),
-                preferences.investment_horizon
-            )
+        except Exception as e:
+            print(f"Error during analysis: {str(e)}")
+            raise
+
+    async def analyze_horizons(self, symbol: str, preferences: UserPreferences,
+                               horizons: Tuple[str, ...] = ('short', 'medium', 'long')) -> Dict[str, Analysis]:
+        print(f"\n=== Starting Multi-Horizon Analysis for {symbol} ===")
+        
+        try:
+            # Perception Phase: one download of the longest window, sliced per horizon
+            print("Gathering market data and context...")
+            perceived = await self.perception.perceive_horizons(symbol, preferences, list(horizons))
             
-            # Output detailed analysis
-            self._print_analysis_summary(analysis, perceived_data['market_context'])
+            # Memory Integration
+            print("Checking historical patterns...")
+            historical_data = await self.memory.retrieve(f"{symbol}_historical", preferences.investment_horizon)
+            if historical_data:
+                print("Historical data found and integrated")
             
-            return analysis
+            # Decisions for every horizon run concurrently; only the user's own
+            # horizon is stored, so memory doesn't depend on which finishes last
+            print("Processing decisions with AI analysis...")
+            analyses = await asyncio.gather(*[
+                self._complete_analysis(
+                    symbol,
+                    perceived[horizon],
+                    preferences.model_copy(update={'investment_horizon': horizon}),
+                    historical_data,
+                    store=horizon == preferences.investment_horizon
+                )
+                for horizon in horizons
+            ])
+            return dict(zip(horizons, analyses))
             
         except Exception as e:
             print(f"Error during analysis: {str(e)}")
             raise
 
-    def _print_analysis_summary(self, analysis: Analysis, market_context: Dict[str, Any]):
+    async def _complete_analysis(self, symbol: str, perceived_data: Dict[str, Any],
+                                 preferences: UserPreferences, historical_data: Optional[Dict],
+                                 store: bool = True) -> Analysis:
+        decision = await self.decision.make_decision(
+            perceived_data['technical_analysis'],
+            preferences,
+            historical_data
+        )
+        
+        # Create comprehensive analysis
+        analysis = Analysis(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            technical_analysis=perceived_data['technical_analysis'],
+            market_data=perceived_data['market_data'],
+            decision=decision,
+            memory_context=historical_data
+        )
+        
+        # Store analysis in memory
+        if store:
+            await self.memory.store(
+                f"{symbol}_historical",
+                analysis.model_dump(),
+                preferences.investment_horizon
+            )
+        
+        # Output detailed analysis
+        self._print_analysis_summary(analysis, perceived_data['market_context'], preferences.investment_horizon)
+        
+        return analysis
+
+    def _print_analysis_summary(self, analysis: Analysis, market_context: Dict[str, Any], horizon: str):
         print("\n=== Analysis Summary ===")
         print(f"Symbol: {analysis.symbol}")
+        print(f"Horizon: {horizon}")
         print(f"Market Trend: {market_context['trend']}")
         print(f"Volume Profile: {market_context['volume_profile']}")
         print(f"\nTechnical Indicators:")
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any, List
 import yfinance as yf
 import pandas as pd
@@ -28,14 +29,30 @@ class PerceptionLayer:
             print(f"Error processing prompt with Flash model: {str(e)}")
             return ""
 
+    HORIZON_DAYS = {
+        'short': 180,  # Increased from 90d to 180d
+        'medium': 365,  # Increased from 180d to 365d
+        'long': 730  # Increased from 365d to 730d (2 years)
+    }
+
     def _fetch_market_data(self, symbol: str, horizon: str) -> pd.DataFrame:
-        periods = {
-            'short': '180d',  # Increased from 90d to 180d
-            'medium': '365d',  # Increased from 180d to 365d
-            'long': '730d'  # Increased from 365d to 730d (2 years)
-        }
         ticker = yf.Ticker(f"{symbol}-USD")
-        return ticker.history(period=periods.get(horizon, '365d'))  # Default to medium if not specified
+        return ticker.history(period=f"{self.HORIZON_DAYS.get(horizon, 365)}d")  # Default to medium if not specified
+
+    def _slice_horizons(self, data: pd.DataFrame, horizons: List[str], longest: str) -> Dict[str, pd.DataFrame]:
+        """Cut one long history into the trailing window of each horizon.
+
+        The longest horizon keeps the download as is. Shorter windows keep every
+        bar from N days before the last one, inclusive, like the period download.
+        """
+        slices = {}
+        for horizon in horizons:
+            if self.HORIZON_DAYS.get(horizon, 365) == self.HORIZON_DAYS.get(longest, 365):
+                slices[horizon] = data
+                continue
+            start = data.index[-1] - pd.Timedelta(days=self.HORIZON_DAYS.get(horizon, 365))
+            slices[horizon] = data[data.index >= start]
+        return slices
 
     async def perceive(self, symbol: str, preferences: UserPreferences) -> Dict[str, Any]:
         # Allow more tokens for analysis
@@ -103,6 +120,28 @@ class PerceptionLayer:
             'market_context': self._parse_market_context(market_context)
         }
 
+    async def perceive_horizons(self, symbol: str, preferences: UserPreferences, horizons: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Perceive several horizons from a single download of the longest window."""
+        if not horizons:
+            raise ValueError("At least one investment horizon is required")
+        longest = max(horizons, key=lambda h: self.HORIZON_DAYS.get(h, 365))
+        market_data = self._fetch_market_data(symbol, longest)
+        slices = self._slice_horizons(market_data, horizons, longest)
+
+        contexts = await asyncio.gather(*[
+            self._process_prompt(self.prompts.get_market_context_prompt(symbol, horizon))
+            for horizon in horizons
+        ])
+
+        return {
+            horizon: {
+                'market_data': self._format_market_data(slices[horizon]),
+                'technical_analysis': self._calculate_technical_indicators(slices[horizon]),
+                'market_context': self._parse_market_context(context)
+            }
+            for horizon, context in zip(horizons, contexts)
+        }
+
     def _parse_market_context(self, context: str) -> Dict[str, Any]:
         parsed = {
             'trend': 'SIDEWAYS',
@@ -0,0 +1,400 @@
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import multiprocessing
+import os
+import random
+import sys
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+import grpc
+import numpy as np
+import pandas as pd
+from google.ai import generativelanguage as glm
+from crypto_analyzer import CryptoAnalyzer
+from layers.perception import PerceptionLayer
+from models.preferences import UserPreferences
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+SYMBOLS = ['BTC', 'ETH', 'SOL', 'DOT', 'ADA', 'XRP', 'LTC', 'BCH']
+PHASES = [
+    ('perception', 'perception', 'perceive'),
+    ('memory_retrieve', 'memory', 'retrieve'),
+    ('decision', 'decision', 'make_decision'),
+    ('memory_store', 'memory', 'store'),
+]
+GENERATIVE_SERVICE = 'google.ai.generativelanguage.v1beta.GenerativeService'
+
+# Per-request state, so shared fakes can attribute work to the phase and user that caused it
+_current_phase = contextvars.ContextVar('current_phase', default='other')
+_user_rng = contextvars.ContextVar('user_rng', default=None)
+
+def canned_response(prompt: str, rng: random.Random) -> str:
+    if prompt.startswith('Analyze crypto market risk'):
+        return f"RISK:[{rng.choice(['LOW', 'MEDIUM', 'HIGH'])}]\nEVIDENCE:[fixture]\nCONFIDENCE:[0.6]"
+    if prompt.startswith('Recommend crypto trade action'):
+        return (f"ACTION:[{rng.choice(['BUY', 'SELL', 'HOLD'])}]\nREASON:[fixture signal]\n"
+                "SUPPORT:[load test]\nMITIGATION:[stop loss]")
+    if 'market context' in prompt:
+        return "TREND:[SIDEWAYS]\nVOLUME:[STABLE]\nSUPPORT:[100]\nRESISTANCE:[200]\nPATTERNS:[range]"
+    return "QUALITY:[pass]\nLOGIC:[valid]\nRISK:[acceptable]\nALTERNATIVES:[none]"
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGeminiModel:
+    """In-process stand-in for the Gemini model with configurable latency and errors.
+
+    Only the model round-trip is simulated: the client library, request
+    serialization and connection overhead are not measured.
+    """
+
+    def __init__(self, latency: float, error_rate: float, rng: random.Random):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = rng
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.errors = 0
+
+    async def generate_content_async(self, prompt: str, **kwargs) -> FakeResponse:
+        rng = _user_rng.get() or self.rng
+        self.calls[_current_phase.get()] += 1
+        await asyncio.sleep(self.latency * rng.uniform(0.5, 1.5))
+        if rng.random() < self.error_rate:
+            self.errors += 1
+            raise RuntimeError("Fake Gemini error")
+        return FakeResponse(canned_response(prompt, rng))
+
+def _serve_fake_gemini(latency: float, error_rate: float, seed: float, port, ready, errors):
+    asyncio.run(_fake_gemini_server(latency, error_rate, seed, port, ready, errors))
+
+async def _fake_gemini_server(latency: float, error_rate: float, seed: float, port, ready, errors):
+    rng = random.Random(seed)
+
+    async def generate_content(request: glm.GenerateContentRequest, context) -> glm.GenerateContentResponse:
+        await asyncio.sleep(latency * rng.uniform(0.5, 1.5))
+        if rng.random() < error_rate:
+            with errors.get_lock():
+                errors.value += 1
+            await context.abort(grpc.StatusCode.INTERNAL, "Fake Gemini error")
+        text = canned_response(request.contents[-1].parts[0].text, rng)
+        return glm.GenerateContentResponse(candidates=[glm.Candidate(
+            content=glm.Content(parts=[glm.Part(text=text)], role='model'),
+            finish_reason=glm.Candidate.FinishReason.STOP
+        )])
+
+    server = grpc.aio.server()
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(GENERATIVE_SERVICE, {
+        'GenerateContent': grpc.unary_unary_rpc_method_handler(
+            generate_content,
+            request_deserializer=glm.GenerateContentRequest.deserialize,
+            response_serializer=glm.GenerateContentResponse.serialize
+        )
+    }),))
+    port.value = server.add_insecure_port('127.0.0.1:0')
+    await server.start()
+    ready.set()
+    await server.wait_for_termination()
+
+class FakeGeminiServer:
+    """Serves canned Gemini responses over gRPC from a child process.
+
+    The analyzer's models reach it through the real async client and gRPC
+    transport, so request serialization and connection handling are measured.
+    Latency and faults come from the server's seeded rng in arrival order,
+    so which request they hit can vary between runs.
+    """
+
+    def __init__(self, latency: float, error_rate: float, seed: float):
+        context = multiprocessing.get_context('spawn')
+        self._port = context.Value('i', 0)
+        self._errors = context.Value('i', 0)
+        self._ready = context.Event()
+        self._process = context.Process(
+            target=_serve_fake_gemini,
+            args=(latency, error_rate, seed, self._port, self._ready, self._errors),
+            daemon=True
+        )
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._process.start()
+        if not self._ready.wait(30):
+            self.stop()
+            raise RuntimeError("Fake Gemini server did not start")
+
+    @property
+    def errors(self) -> int:
+        return self._errors.value
+
+    def connect(self, models: list):
+        """Point the models at this server through the real async client."""
+        transport = glm.GenerativeServiceAsyncClient.get_transport_class('grpc_asyncio')
+        channel = grpc.aio.insecure_channel(f"127.0.0.1:{self._port.value}")
+        client = glm.GenerativeServiceAsyncClient(transport=transport(channel=channel))
+        generate_content = client.generate_content
+
+        async def counted(*args, **kwargs):
+            self.calls[_current_phase.get()] += 1
+            return await generate_content(*args, **kwargs)
+
+        client.generate_content = counted
+        for model in models:
+            model._async_client = client
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+class FixtureMarketData:
+    """Replaces the yfinance download with fixture or synthetic price history.
+
+    Latency is simulated with a blocking sleep, like the real synchronous download.
+    """
+
+    def __init__(self, latency: float, error_rate: float, rng: random.Random, fixture: Optional[str] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = rng
+        self.fixture = pd.read_csv(fixture, index_col=0, parse_dates=True) if fixture else None
+        self.calls = 0
+        self.errors = 0
+
+    def fetch(self, symbol: str, horizon: str) -> pd.DataFrame:
+        rng = _user_rng.get() or self.rng
+        self.calls += 1
+        time.sleep(self.latency * rng.uniform(0.5, 1.5))
+        if rng.random() < self.error_rate:
+            self.errors += 1
+            raise ConnectionError(f"Fixture market data error for {symbol}")
+        history = self._history(symbol)
+        # A period download includes the bar N days before the last one
+        start = history.index[-1] - pd.Timedelta(days=PerceptionLayer.HORIZON_DAYS.get(horizon, 365))
+        return history[history.index >= start]
+
+    def _history(self, symbol: str) -> pd.DataFrame:
+        if self.fixture is not None:
+            return self.fixture
+        rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+        dates = pd.date_range(end=pd.Timestamp('2025-01-01', tz='UTC'), periods=731, freq='D')
+        return pd.DataFrame({
+            'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates)))),
+            'Volume': rng.uniform(1e6, 5e6, len(dates))
+        }, index=dates)
+
+class LoadTestMetrics:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.failed_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.prompts: Dict[str, int] = defaultdict(int)
+        self.empty_responses: Dict[str, int] = defaultdict(int)
+        self.disabled_phases: List[str] = []
+        self.loop_lag: List[float] = []
+        self.elapsed = 0.0
+
+    def instrument(self, analyzer: CryptoAnalyzer):
+        for phase, layer_name, method_name in PHASES:
+            if phase in self.disabled_phases:
+                continue
+            layer = getattr(analyzer, layer_name)
+            setattr(layer, method_name, self._timed(phase, getattr(layer, method_name)))
+        for layer in (analyzer.perception, analyzer.decision):
+            layer._process_prompt = self._counted(layer._process_prompt)
+
+    def _timed(self, phase: str, method):
+        async def wrapper(*args, **kwargs):
+            token = _current_phase.set(phase)
+            start = time.perf_counter()
+            try:
+                result = await method(*args, **kwargs)
+            except Exception:
+                self.failed_latencies[phase].append(time.perf_counter() - start)
+                raise
+            finally:
+                _current_phase.reset(token)
+            self.latencies[phase].append(time.perf_counter() - start)
+            return result
+        return wrapper
+
+    def _counted(self, method):
+        # The layers swallow model errors and fall back to an empty answer
+        async def wrapper(prompt: str) -> str:
+            phase = _current_phase.get()
+            self.prompts[phase] += 1
+            response = await method(prompt)
+            if not response:
+                self.empty_responses[phase] += 1
+            return response
+        return wrapper
+
+    async def monitor_loop_lag(self, interval: float = 0.01):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag.append(time.perf_counter() - start - interval)
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def random_preferences(rng: random.Random) -> UserPreferences:
+    return UserPreferences(
+        risk_tolerance=rng.choice(['low', 'medium', 'high']),
+        preferred_indicators=rng.sample(['RSI', 'MACD', 'SMA', 'VOLUME'], rng.randint(1, 4)),
+        investment_horizon=rng.choice(['short', 'medium', 'long']),
+        max_risk_percentage=round(rng.uniform(0.3, 0.9), 2),
+        notification_frequency=rng.choice(['real-time', 'daily', 'weekly'])
+    )
+
+async def simulate_user(analyzer: CryptoAnalyzer, metrics: LoadTestMetrics, rng: random.Random,
+                        requests: int, think_time: float):
+    _user_rng.set(rng)
+    preferences = random_preferences(rng)
+    symbols = rng.sample(SYMBOLS, rng.randint(1, 3))
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            await analyzer.analyze(rng.choice(symbols), preferences)
+        except Exception as e:
+            metrics.errors[type(e).__name__] += 1
+            metrics.failed_latencies['total'].append(time.perf_counter() - start)
+        else:
+            metrics.latencies['total'].append(time.perf_counter() - start)
+        if think_time:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+async def check_horizons(perception: PerceptionLayer, fixture: Optional[str]) -> bool:
+    """Check that each analyze_horizons slice gives the same indicators as its own download."""
+    market = FixtureMarketData(0, 0, random.Random(0), fixture)
+    perception._fetch_market_data = market.fetch
+    horizons = list(PerceptionLayer.HORIZON_DAYS)
+    mismatches = 0
+    for symbol in SYMBOLS:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            perceived = await perception.perceive_horizons(symbol, UserPreferences(), horizons)
+        for horizon in horizons:
+            single = perception._calculate_technical_indicators(market.fetch(symbol, horizon))
+            if perceived[horizon]['technical_analysis'] != single:
+                mismatches += 1
+                print(f"Horizon check: {symbol} {horizon} differs from a single-horizon run")
+    print(f"Horizon check: {len(SYMBOLS) * len(horizons) - mismatches}/{len(SYMBOLS) * len(horizons)} match")
+    return mismatches == 0
+
+async def run_load_test(args, gemini):
+    seeds = random.Random(args.seed)
+    analyzer = CryptoAnalyzer()
+    market = FixtureMarketData(args.market_latency, args.market_error_rate, random.Random(seeds.random()), args.fixture)
+    if args.gemini == 'in-process':
+        for layer in (analyzer.perception, analyzer.decision, analyzer.memory):
+            layer.model = gemini
+    else:
+        gemini.connect([analyzer.perception.model, analyzer.decision.model, analyzer.memory.model])
+    if args.check_horizons and not await check_horizons(analyzer.perception, args.fixture):
+        raise SystemExit(1)
+    analyzer.perception._fetch_market_data = market.fetch
+
+    metrics = LoadTestMetrics()
+    if not args.keep_memory:
+        # Repeat symbols would otherwise fail with KeyError('returns') in DecisionLayer.make_decision
+        analyzer.memory.retrieve = lambda key, context: asyncio.sleep(0)
+        metrics.disabled_phases.append('memory_retrieve')
+    metrics.instrument(analyzer)
+    monitor = asyncio.create_task(metrics.monitor_loop_lag())
+
+    start = time.perf_counter()
+    # The analyzer prints progress for every run; keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        await asyncio.gather(*[
+            simulate_user(analyzer, metrics, random.Random(seeds.random()), args.requests, args.think_time)
+            for _ in range(args.users)
+        ])
+    metrics.elapsed = time.perf_counter() - start
+
+    monitor.cancel()
+    return metrics, market
+
+def print_report(args, metrics: LoadTestMetrics, market: FixtureMarketData, gemini):
+    completed = len(metrics.latencies['total'])
+    failed = len(metrics.failed_latencies['total'])
+
+    print("\n=== Load Test Summary ===")
+    print(f"Users: {args.users}  Requests per user: {args.requests}  Gemini: {args.gemini}"
+          f"  Memory retrieval: {'on' if args.keep_memory else 'off'}")
+    print(f"Completed: {completed}  Failed: {failed}  Elapsed: {metrics.elapsed:.2f}s")
+    print(f"Throughput: {completed / metrics.elapsed:.2f} completed analyses/s")
+    print(f"Gemini calls: {sum(gemini.calls.values())}  Injected Gemini errors: {gemini.errors}")
+    print(f"Market data calls: {market.calls}  Injected market data errors: {market.errors}")
+
+    print("\nLatency per phase, successful calls only (ms):")
+    print(f"{'phase':<16}{'ok':>6}{'failed':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for phase in [p[0] for p in PHASES] + ['total']:
+        if phase in metrics.disabled_phases:
+            print(f"{phase:<16}{'disabled':>14}")
+            continue
+        values = metrics.latencies[phase]
+        print(f"{phase:<16}{len(values):>6}{len(metrics.failed_latencies[phase]):>8}" + "".join(
+            f"{percentile(values, pct) * 1000:>10.1f}" for pct in (50, 95, 99)))
+
+    print("\nModel prompts per phase:")
+    print(f"{'phase':<16}{'prompts':>8}{'gemini':>8}{'empty':>8}")
+    for phase in sorted(set(metrics.prompts) | set(gemini.calls)):
+        print(f"{phase:<16}{metrics.prompts[phase]:>8}{gemini.calls[phase]:>8}{metrics.empty_responses[phase]:>8}")
+        if metrics.prompts[phase] > gemini.calls[phase]:
+            print(f"  WARNING: {metrics.prompts[phase] - gemini.calls[phase]} {phase} prompts never reached the model;"
+                  " its latency excludes the model round-trip")
+
+    print(f"\nEvent loop lag (ms): p50 {percentile(metrics.loop_lag, 50) * 1000:.1f}"
+          f"  p99 {percentile(metrics.loop_lag, 99) * 1000:.1f}"
+          f"  max {max(metrics.loop_lag, default=0) * 1000:.1f}")
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            peak_rss //= 1024  # bytes on macOS, kilobytes on Linux
+        print(f"Peak RSS: {peak_rss / 1024:.1f} MB")
+    else:
+        print("Peak RSS: unavailable on this platform")
+    if metrics.errors:
+        print("\nErrors:")
+        for name, count in sorted(metrics.errors.items()):
+            print(f"{name}: {count}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulate concurrent users against CryptoAnalyzer offline")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=5, help="analyses per user")
+    parser.add_argument('--think-time', type=float, default=0.0, help="mean pause between a user's requests (s)")
+    parser.add_argument('--gemini', choices=['server', 'in-process'], default='server',
+                        help="serve the fake Gemini over local gRPC, or replace the model object in-process")
+    parser.add_argument('--gemini-latency', type=float, default=0.2, help="mean fake Gemini latency (s)")
+    parser.add_argument('--gemini-error-rate', type=float, default=0.0)
+    parser.add_argument('--market-latency', type=float, default=0.05, help="mean market data latency (s)")
+    parser.add_argument('--market-error-rate', type=float, default=0.0)
+    parser.add_argument('--fixture', help="CSV with a date index and Close/Volume columns")
+    parser.add_argument('--keep-memory', action='store_true',
+                        help="let repeat symbols read stored analyses (currently fails with KeyError 'returns')")
+    parser.add_argument('--check-horizons', action='store_true',
+                        help="first check that multi-horizon indicators match single-horizon runs")
+    parser.add_argument('--seed', type=int, default=0)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    gemini_seed = random.Random(f"{args.seed}-gemini").random()
+    if args.gemini == 'server':
+        gemini = FakeGeminiServer(args.gemini_latency, args.gemini_error_rate, gemini_seed)
+    else:
+        gemini = FakeGeminiModel(args.gemini_latency, args.gemini_error_rate, random.Random(gemini_seed))
+    try:
+        print_report(args, *asyncio.run(run_load_test(args, gemini)), gemini)
+    finally:
+        if args.gemini == 'server':
+            gemini.stop()
@@ -24,11 +24,12 @@ async def main():
         print("3. Analyze ETH")
         print("4. Analyze Custom Token")
         print("5. View Historical Analysis")
-        print("6. Exit")
+        print("6. Compare Investment Horizons")
+        print("7. Exit")
         
-        choice = input("\nEnter your choice (1-6): ")
+        choice = input("\nEnter your choice (1-7): ")
         
-        if choice == '6':
+        if choice == '7':
             break
             
         if choice == '1':
@@ -41,6 +42,16 @@ async def main():
             # Historical analysis view will be handled here
             continue
             
+        if choice == '6':
+            symbol = input("Enter token symbol (e.g., BTC, ETH): ")
+            print(f"\nComparing short/medium/long horizons for {symbol}...")
+            try:
+                await analyzer.analyze_horizons(symbol, preferences)
+                input("\nPress Enter to continue...")
+            except Exception as e:
+                print(f"Analysis failed: {str(e)}")
+            continue
+            
         symbol = {
             '2': 'BTC',
             '3': 'ETH',